@@ -4,37 +4,68 @@ LightChain L2 Continuous Transaction Generator
 Generates realistic blockchain activity 24/7 like a real blockchain
 """
 
-import requests
 import time
 import json
 import random
+import itertools
+import collections
+import functools
 import os
 import sys
-from datetime import datetime
 import threading
-import signal
+import atexit
+import logging
+import logging.handlers
+import queue
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError, as_completed
+
+# orjson is optional; fall back to compact stdlib encoding when it isn't installed
+try:
+    import orjson
+    _json_dumps = orjson.dumps
+    _json_loads = orjson.loads
+except ImportError:
+    def _json_dumps(obj):
+        return json.dumps(obj, separators=(",", ":")).encode()
+    _json_loads = json.loads
 
 # Configuration from environment variables
 RPC_URL = os.getenv('RPC_URL', 'http://localhost:8545')
 SEQUENCER_URL = os.getenv('SEQUENCER_URL', 'http://localhost:8555')
-TX_INTERVAL = int(os.getenv('TX_INTERVAL', '3'))  # seconds between transactions
+TX_INTERVAL = float(os.getenv('TX_INTERVAL', '3'))  # seconds between transactions
+MAX_IN_FLIGHT = int(os.getenv('MAX_IN_FLIGHT', '16'))  # concurrent transaction submissions
 ENABLE_BURST_MODE = os.getenv('ENABLE_BURST_MODE', 'true').lower() == 'true'
+CLIENT_VERSION_TTL = 300  # seconds a fetched web3_clientVersion is reused while the endpoint stays healthy
+RPC_TIMEOUT = (1.5, 8)  # (connect, read) seconds, so dead endpoints fail fast
+RPC_RETRIES = 3  # connect/5xx retries per request; read timeouts are never retried
+RPC_BACKOFF = 0.5  # urllib3 backoff factor: sleeps 0, 1, 2, ... seconds between retries
+# Worst case for one request: every attempt hits both timeouts, plus all backoff sleeps
+SEND_RACE_TIMEOUT = (RPC_RETRIES + 1) * sum(RPC_TIMEOUT) + sum(
+    RPC_BACKOFF * 2 ** (n - 1) for n in range(2, RPC_RETRIES + 1)
+)
+ENDPOINT_COOLDOWN = 30  # seconds an endpoint is skipped after a connection failure
+RECENT_OK_WINDOW = 60  # a cached client version only counts as liveness if the endpoint answered this recently
 
 # Pre-funded development accounts (from genesis.yaml)
-ACCOUNTS = [
-    {
-        "address": "0x742A4D1A0Ac05A73A48F10C2E2d6b0E3f1b2e3F4",
-        "private_key": "0x0123456789abcdef0123456789abcdef0123456789abcdef0123456789abcdef"
-    },
-    {
-        "address": "0x8B3A4D1A0Ac05A73A48F10C2E2d6b0E3f1b2e3F5", 
-        "private_key": "0x1123456789abcdef0123456789abcdef0123456789abcdef0123456789abcdef"
-    },
-    {
-        "address": "0x9C4A4D1A0Ac05A73A48F10C2E2d6b0E3f1b2e3F6",
-        "private_key": "0x2123456789abcdef0123456789abcdef0123456789abcdef0123456789abcdef"
-    }
-]
+Account = collections.namedtuple("Account", "address short_address private_key")
+
+ACCOUNTS = tuple(
+    Account(a["address"], a["address"][:10], a["private_key"])
+    for a in (
+        {
+            "address": "0x742A4D1A0Ac05A73A48F10C2E2d6b0E3f1b2e3F4",
+            "private_key": "0x0123456789abcdef0123456789abcdef0123456789abcdef0123456789abcdef"
+        },
+        {
+            "address": "0x8B3A4D1A0Ac05A73A48F10C2E2d6b0E3f1b2e3F5",
+            "private_key": "0x1123456789abcdef0123456789abcdef0123456789abcdef0123456789abcdef"
+        },
+        {
+            "address": "0x9C4A4D1A0Ac05A73A48F10C2E2d6b0E3f1b2e3F6",
+            "private_key": "0x2123456789abcdef0123456789abcdef0123456789abcdef0123456789abcdef"
+        },
+    )
+)
 
 # Transaction patterns (realistic blockchain activity)
 TX_PATTERNS = [
@@ -44,76 +75,284 @@ TX_PATTERNS = [
     {"type": "contract_call", "weight": 5, "amount_range": (0, 100)}
 ]
 
-# Global statistics
-stats = {
-    "total_transactions": 0,
-    "successful_transactions": 0,
-    "failed_transactions": 0,
-    "start_time": datetime.now(),
-    "last_block_check": 0,
-    "blocks_observed": 0
-}
+# Cumulative weights and flattened amount bounds, computed once for the generator hot path
+_PATTERN_CUM_WEIGHTS = list(itertools.accumulate(p["weight"] for p in TX_PATTERNS))
+for _pattern in TX_PATTERNS:
+    _pattern["min_amount"], _pattern["max_amount"] = _pattern["amount_range"]
+
+# Pre-encoded constants for the common transaction fields
+_HEX_21000 = "0x5208"  # hex(21000), gas limit of a plain transfer
+_ZERO_DATA_MAX = "00" * 100  # largest contract-call payload, sliced per tx
+_GAS_HEX = tuple(hex(g * 10**9) for g in range(1, 51))  # 1-50 Gwei gas price buckets
+
+# Pre-sized transaction skeleton; copied per tx because sends overlap in the pipeline
+_TX_TEMPLATE = {"from": "", "to": "", "value": "", "gas": _HEX_21000, "gasPrice": "", "data": "0x"}
+
+# Global statistics (plain module-level counters, updated under _stats_lock; start_time is monotonic)
+total_transactions = 0
+successful_transactions = 0
+failed_transactions = 0
+last_block_check = 0
+blocks_observed = 0
+start_time = time.monotonic()
+
+# Set by the signal handler; waiting on it lets sleeps wake up immediately on shutdown
+_stop = threading.Event()
+_stats_lock = threading.Lock()
+
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Circuit breaker: monotonic time until which an endpoint is considered down
+_endpoint_down_until = {RPC_URL: 0.0, SEQUENCER_URL: 0.0}
 
-running = True
+# url -> (web3_clientVersion, monotonic expiry); evicted whenever an RPC to that url fails
+_client_versions = {}
+# url -> monotonic time of the last successful JSON-RPC response
+_endpoint_last_ok = {}
+# url -> last client version seen, kept across evictions so only real changes are logged
+_last_client_version = {}
+
+# Per-endpoint JSON-RPC batch capability, learned from the first batch sent to each url
+_supports_batch = {}
+
+# Bounded pipeline of in-flight transactions; each one races two endpoint requests
+_in_flight = threading.BoundedSemaphore(MAX_IN_FLIGHT)
+_tx_executor = ThreadPoolExecutor(max_workers=MAX_IN_FLIGHT, thread_name_prefix="tx-pipeline")
+_send_executor = ThreadPoolExecutor(max_workers=2 * MAX_IN_FLIGHT, thread_name_prefix="tx-send")
+
+class _CachedTimeFormatter(logging.Formatter):
+    """Formatter that reuses the formatted timestamp for records logged within the same second"""
+    
+    def __init__(self, fmt=None, datefmt=None):
+        super().__init__(fmt, datefmt)
+        # [second, formatted string]; only the listener thread formats, so no locking needed
+        self._ts_cache = [-1, ""]
+    
+    def formatTime(self, record, datefmt=None):
+        sec = int(record.created)
+        ts_cache = self._ts_cache
+        if sec != ts_cache[0]:
+            ts_cache[1] = time.strftime(datefmt or self.datefmt, self.converter(sec))
+            ts_cache[0] = sec
+        return ts_cache[1]
+    
+    def format(self, record):
+        # Keep the script's "WARN" label without renaming WARNING for every logger in the process
+        if record.levelno == logging.WARNING:
+            record.levelname = "WARN"
+        return super().format(record)
+
+# Log records are only enqueued by callers; formatting and stdout I/O happen on the listener thread
+# Worker, monitor and main threads all log concurrently; SimpleQueue.put never blocks and is
+# reentrant, so an enqueue can't stall or deadlock a caller (queue.Queue.put takes a plain Lock)
+_log_queue = queue.SimpleQueue()
+_log_handler = logging.StreamHandler(sys.stdout)
+_log_handler.setFormatter(_CachedTimeFormatter("[%(asctime)s] %(levelname)s: %(message)s", "%Y-%m-%d %H:%M:%S"))
+_log_listener = logging.handlers.QueueListener(_log_queue, _log_handler)
+
+logger = logging.getLogger("txgen")
+logger.addHandler(logging.handlers.QueueHandler(_log_queue))
+logger.setLevel(logging.INFO)
+logger.propagate = False
+
+@functools.cache
+def _start_logging():
+    """Start the listener thread that drains the log queue (once, from main)"""
+    _log_listener.start()
+    atexit.register(_log_listener.stop)
 
 def log_message(msg, level="INFO"):
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    print(f"[{timestamp}] {level}: {msg}", flush=True)
+    logger.log(getattr(logging, level), msg)
 
 def signal_handler(signum, frame):
-    global running
-    log_message("Received shutdown signal. Stopping transaction generator...")
-    running = False
+    # Only set the event here; the main thread logs the shutdown once it wakes up
+    _stop.set()
+
+@functools.cache
+def _get_session():
+    """Shared HTTP session so validator/sequencer sockets are kept alive and reused"""
+    # requests/urllib3 are imported on first use to keep module import cheap
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+    
+    session = requests.Session()
+    session.headers.update({"Connection": "keep-alive"})
+    # Connection failures and 502/503/504 are retried inside urllib3 with exponential backoff.
+    # Read timeouts are not: the POST may already have reached the node (eth_sendTransaction isn't idempotent).
+    # read=False re-raises them as-is, so requests reports ReadTimeout rather than a ConnectionError
+    retry_policy = Retry(
+        total=RPC_RETRIES,
+        read=False,
+        backoff_factor=RPC_BACKOFF,
+        status_forcelist=(502, 503, 504),
+        allowed_methods=frozenset(["POST"])
+    )
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=max(16, MAX_IN_FLIGHT), max_retries=retry_policy)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
 
 def send_rpc_request(url, method, params=None):
-    """Send JSON-RPC request with retry logic"""
-    if params is None:
-        params = []
+    """Send JSON-RPC request (retries are handled by the session's adapter)"""
+    import requests
     
-    payload = {
+    body = _json_dumps({
         "jsonrpc": "2.0",
         "method": method,
-        "params": params,
-        "id": random.randint(1, 1000)
-    }
+        "params": params or [],
+        "id": random.randint(1, 1 << 30)
+    })
+    
+    try:
+        response = _get_session().post(url, data=body, headers=_JSON_HEADERS, timeout=RPC_TIMEOUT)
+        if _endpoint_down_until.get(url):
+            _endpoint_down_until[url] = 0.0
+        if response.status_code == 200:
+            result = _json_loads(response.content)
+            _endpoint_last_ok[url] = time.monotonic()
+            return result
+        log_message(f"HTTP {response.status_code} from {url}", "WARN")
+        _client_versions.pop(url, None)
+    except requests.exceptions.ConnectionError as e:
+        # Connect failures (including connect timeouts) bench the endpoint
+        _client_versions.pop(url, None)
+        _endpoint_down_until[url] = time.monotonic() + ENDPOINT_COOLDOWN
+        log_message(f"RPC request failed after retries: {e}", "ERROR")
+    except requests.exceptions.ReadTimeout as e:
+        # A slow reply from a live node: not retried, and no cooldown
+        _client_versions.pop(url, None)
+        log_message(f"RPC request to {url} timed out waiting for a response: {e}", "WARN")
+    except requests.exceptions.RequestException as e:
+        _client_versions.pop(url, None)
+        log_message(f"RPC request failed after retries: {e}", "ERROR")
+    except ValueError as e:
+        _client_versions.pop(url, None)
+        log_message(f"Invalid JSON-RPC response from {url}: {e}", "WARN")
+    
+    return None
+
+def _post_batch(url, calls):
+    """POST calls as one JSON-RPC array; returns responses keyed by id, or None if not answered as a batch"""
+    import requests
+    
+    payload = [
+        {"jsonrpc": "2.0", "method": method, "params": params or [], "id": call_id}
+        for call_id, (method, params) in enumerate(calls, start=1)
+    ]
+    
+    response = _get_session().post(url, data=_json_dumps(payload), headers=_JSON_HEADERS, timeout=RPC_TIMEOUT)
+    # 400 means the server rejected the array itself; any other non-200 (500, 429, 413, restarts)
+    # is an ordinary failed request and must not be taken as missing batch support
+    if response.status_code == 400:
+        return None
+    if response.status_code != 200:
+        raise requests.exceptions.HTTPError(f"HTTP {response.status_code} from {url}", response=response)
+    try:
+        results = _json_loads(response.content)
+    except ValueError:
+        return None
+    
+    # Servers without batch support answer with an error object instead of an array
+    if not isinstance(results, list) or len(results) != len(payload):
+        return None
+    by_id = {item.get("id"): item for item in results if isinstance(item, dict)}
+    if by_id.keys() != {item["id"] for item in payload}:
+        return None
+    return by_id
+
+def send_rpc_batch(url, calls):
+    """Send a JSON-RPC batch of (method, params) calls, returning responses keyed by id"""
+    import requests
     
-    max_retries = 3
-    for attempt in range(max_retries):
+    if not calls:
+        return {}
+    
+    if _supports_batch.get(url, True):
         try:
-            response = requests.post(url, json=payload, timeout=10)
-            if response.status_code == 200:
-                return response.json()
-            else:
-                log_message(f"HTTP {response.status_code} from {url}", "WARN")
+            results = _post_batch(url, calls)
         except requests.exceptions.RequestException as e:
-            if attempt < max_retries - 1:
-                log_message(f"RPC request failed (attempt {attempt + 1}): {e}", "WARN")
-                time.sleep(2 ** attempt)  # Exponential backoff
-            else:
-                log_message(f"RPC request failed after {max_retries} attempts: {e}", "ERROR")
+            # Same circuit-breaker/cache bookkeeping as a failed send_rpc_request
+            if isinstance(e, requests.exceptions.ConnectionError):
+                _endpoint_down_until[url] = time.monotonic() + ENDPOINT_COOLDOWN
+            _client_versions.pop(url, None)
+            log_message(f"RPC batch request to {url} failed: {e}", "WARN")
+            return {}
+        # The server answered (as a batch or with a rejection), so it is reachable; clear the breaker like send_rpc_request does
+        if _endpoint_down_until.get(url):
+            _endpoint_down_until[url] = 0.0
+        if results is not None:
+            _supports_batch[url] = True
+            _endpoint_last_ok[url] = time.monotonic()
+            return results
+        _supports_batch[url] = False
+        log_message(f"Batch request not supported by {url}, falling back to parallel calls", "WARN")
     
-    return None
+    # No batch support: issue the calls individually, overlapping their round-trips
+    with ThreadPoolExecutor(max_workers=min(len(calls), 8)) as executor:
+        futures = {
+            call_id: executor.submit(send_rpc_request, url, method, params)
+            for call_id, (method, params) in enumerate(calls, start=1)
+        }
+        return {call_id: future.result() for call_id, future in futures.items()}
+
+def _cached_client_version(url):
+    """Return the cached web3_clientVersion for url, or None if stale or the endpoint is down"""
+    entry = _client_versions.get(url)
+    if entry is None:
+        return None
+    version, expires_at = entry
+    now = time.monotonic()
+    if now >= expires_at or now < _endpoint_down_until.get(url, 0.0):
+        _client_versions.pop(url, None)
+        return None
+    return version
+
+def _store_client_version(url, response):
+    if response and "result" in response:
+        previous = _last_client_version.get(url)
+        _last_client_version[url] = response["result"]
+        if response["result"] != previous:
+            log_message(f"🧩 Client at {url}: {response['result']}")
+        _client_versions[url] = (response["result"], time.monotonic() + CLIENT_VERSION_TTL)
+
+def _check_client_version(url):
+    """Liveness probe; skips the RPC only while the version is cached and other traffic just succeeded"""
+    recently_ok = time.monotonic() - _endpoint_last_ok.get(url, float("-inf")) < RECENT_OK_WINDOW
+    if recently_ok and _cached_client_version(url) is not None:
+        return True
+    result = send_rpc_request(url, "web3_clientVersion")
+    _store_client_version(url, result)
+    return result is not None
 
 def check_network_health():
     """Check if blockchain network is healthy"""
+    global last_block_check, blocks_observed
     try:
-        # Check validator
-        result = send_rpc_request(RPC_URL, "web3_clientVersion")
+        # The validator's liveness comes from eth_blockNumber, fetched every time; the sequencer is only
+        # re-probed when its cached version is gone (any failed RPC evicts it) or it has been quiet
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            sequencer_future = executor.submit(_check_client_version, SEQUENCER_URL)
+            if _cached_client_version(RPC_URL) is not None:
+                result = send_rpc_request(RPC_URL, "eth_blockNumber")
+            else:
+                # Refresh the validator's version in the same round-trip as the block number
+                results = send_rpc_batch(RPC_URL, [("web3_clientVersion", None), ("eth_blockNumber", None)])
+                _store_client_version(RPC_URL, results.get(1))
+                result = results.get(2)
+            sequencer_ok = sequencer_future.result()
         validator_ok = result is not None
         
-        # Check sequencer
-        result = send_rpc_request(SEQUENCER_URL, "web3_clientVersion")
-        sequencer_ok = result is not None
-        
         # Check block progression
-        result = send_rpc_request(RPC_URL, "eth_blockNumber")
         current_block = 0
         if result and "result" in result:
             current_block = int(result["result"], 16)
             
-        if current_block > stats["last_block_check"]:
-            stats["blocks_observed"] += current_block - stats["last_block_check"]
-            stats["last_block_check"] = current_block
+        # Monitor and main threads both run health checks; update block counters together
+        with _stats_lock:
+            if current_block > last_block_check:
+                blocks_observed += current_block - last_block_check
+                last_block_check = current_block
             
         return validator_ok, sequencer_ok, current_block
         
@@ -121,70 +360,166 @@ def check_network_health():
         log_message(f"Health check failed: {e}", "ERROR")
         return False, False, 0
 
+def _build_transaction(pattern, from_account, to_account, gas_price):
+    """Fill a transaction from already-drawn pattern, accounts and gas price"""
+    amount = random.randint(pattern["min_amount"], pattern["max_amount"])
+    
+    tx = _TX_TEMPLATE.copy()
+    tx["from"] = from_account.address
+    tx["to"] = to_account.address
+    tx["value"] = hex(amount)
+    tx["gasPrice"] = gas_price
+    
+    # Vary gas limit and payload based on transaction type (template defaults to a plain transfer)
+    if pattern["type"] == "contract_call":
+        tx["gas"] = hex(random.randint(50000, 200000))
+        tx["data"] = "0x" + _ZERO_DATA_MAX[:2 * random.randint(0, 100)]
+    
+    return tx, pattern["type"], amount, from_account, to_account
+
 def generate_realistic_transaction():
     """Generate a realistic transaction based on patterns"""
-    pattern = random.choices(
-        TX_PATTERNS, 
-        weights=[p["weight"] for p in TX_PATTERNS]
-    )[0]
+    pattern = random.choices(TX_PATTERNS, cum_weights=_PATTERN_CUM_WEIGHTS, k=1)[0]
+    
+    # Draw two distinct accounts in one call
+    from_account, to_account = random.sample(ACCOUNTS, 2)
+    
+    # Realistic gas prices (1-50 Gwei)
+    return _build_transaction(pattern, from_account, to_account, random.choice(_GAS_HEX))
+
+def generate_transaction_batch(n):
+    """Generate n realistic transactions, drawing each random field for the whole batch at once"""
+    patterns = random.choices(TX_PATTERNS, cum_weights=_PATTERN_CUM_WEIGHTS, k=n)
+    gas_prices = random.choices(_GAS_HEX, k=n)
     
-    from_account = random.choice(ACCOUNTS)
-    to_account = random.choice(ACCOUNTS)
+    # Recipient is the sender shifted by a non-zero offset, so the pair is always distinct
+    account_count = len(ACCOUNTS)
+    froms = random.choices(range(account_count), k=n)
+    offsets = random.choices(range(1, account_count), k=n)
     
-    # Ensure different accounts
-    while to_account["address"] == from_account["address"]:
-        to_account = random.choice(ACCOUNTS)
+    return [
+        _build_transaction(pattern, ACCOUNTS[f], ACCOUNTS[(f + o) % account_count], gas_price)
+        for pattern, f, o, gas_price in zip(patterns, froms, offsets, gas_prices)
+    ]
+
+def _call_when_settled(futures, callback):
+    """Invoke callback once every future has finished or been cancelled"""
+    if not futures:
+        callback()
+        return
     
-    min_amount, max_amount = pattern["amount_range"]
-    amount = random.randint(min_amount, max_amount)
+    pending = [len(futures)]
+    lock = threading.Lock()
     
-    # Generate realistic gas prices (1-50 Gwei)
-    gas_price = random.randint(1000000000, 50000000000)
+    def _settled(_):
+        with lock:
+            pending[0] -= 1
+            last = pending[0] == 0
+        if last:
+            callback()
     
-    # Vary gas limit based on transaction type
-    if pattern["type"] == "contract_call":
-        gas_limit = random.randint(50000, 200000)
-    else:
-        gas_limit = 21000
-    
-    tx = {
-        "from": from_account["address"],
-        "to": to_account["address"],
-        "value": hex(amount),
-        "gas": hex(gas_limit),
-        "gasPrice": hex(gas_price),
-        "data": "0x" if pattern["type"] != "contract_call" else "0x" + "00" * random.randint(0, 100)
-    }
-    
-    return tx, pattern["type"], amount
-
-def send_transaction(tx, tx_type, amount):
-    """Send transaction to blockchain"""
-    stats["total_transactions"] += 1
-    
-    # Try both validator and sequencer endpoints
+    for future in futures:
+        future.add_done_callback(_settled)
+
+def send_transaction(tx, tx_type, amount, from_account, to_account, on_settled=None):
+    """Send transaction to blockchain (on_settled runs once its endpoint requests are done)"""
+    global total_transactions, successful_transactions, failed_transactions
+    with _stats_lock:
+        total_transactions += 1
+    
+    # Race validator and sequencer endpoints, first success wins; skip endpoints in cooldown
+    now = time.monotonic()
     endpoints = [
-        ("Validator", RPC_URL),
-        ("Sequencer", SEQUENCER_URL)
+        (endpoint_name, url)
+        for endpoint_name, url in (("Validator", RPC_URL), ("Sequencer", SEQUENCER_URL))
+        if now >= _endpoint_down_until.get(url, 0.0)
     ]
     
-    for endpoint_name, url in endpoints:
-        result = send_rpc_request(url, "eth_sendTransaction", [tx])
-        if result and "result" in result:
-            stats["successful_transactions"] += 1
-            log_message(
-                f"✅ {tx_type.title()} tx sent via {endpoint_name}: "
-                f"{tx['from'][:10]}...→{tx['to'][:10]}... "
-                f"({amount} wei) Hash: {result['result'][:10]}..."
-            )
-            return result["result"]
-        elif result and "error" in result:
-            log_message(f"❌ Transaction error on {endpoint_name}: {result['error']}", "WARN")
-    
-    stats["failed_transactions"] += 1
+    def _post_one(endpoint_name, url):
+        return endpoint_name, send_rpc_request(url, "eth_sendTransaction", [tx])
+    
+    futures = [_send_executor.submit(_post_one, name, url) for name, url in endpoints]
+    if on_settled is not None:
+        _call_when_settled(futures, on_settled)
+    try:
+        for future in as_completed(futures, timeout=SEND_RACE_TIMEOUT):
+            endpoint_name, result = future.result()
+            if result and "result" in result:
+                for other in futures:
+                    other.cancel()
+                with _stats_lock:
+                    successful_transactions += 1
+                log_message(
+                    f"✅ {tx_type.title()} tx sent via {endpoint_name}: "
+                    f"{from_account.short_address}...→{to_account.short_address}... "
+                    f"({amount} wei) Hash: {result['result'][:10]}..."
+                )
+                return result["result"]
+            elif result and "error" in result:
+                log_message(f"❌ Transaction error on {endpoint_name}: {result['error']}", "WARN")
+    except FutureTimeoutError:
+        # Drop the stragglers so a timed-out tx isn't POSTed later behind newer ones
+        for future in futures:
+            future.cancel()
+        log_message("❌ Transaction timed out waiting for endpoints", "WARN")
+    
+    with _stats_lock:
+        failed_transactions += 1
     log_message(f"❌ Transaction failed on all endpoints", "ERROR")
     return None
 
+def submit_transaction(tx, tx_type, amount, from_account, to_account):
+    """Queue transaction on the send pipeline, blocking only while it is full"""
+    # The slot is held until the endpoint requests themselves finish, not just send_transaction,
+    # so at most MAX_IN_FLIGHT txs (2 RPCs each) are on the wire even when a race times out
+    _in_flight.acquire()
+    try:
+        future = _tx_executor.submit(
+            send_transaction, tx, tx_type, amount, from_account, to_account, _in_flight.release
+        )
+    except RuntimeError:
+        _in_flight.release()
+        return None
+    return future
+
+class TokenBucket:
+    """Blocking token bucket whose refill rate adapts to observed send outcomes"""
+    
+    MIN_RATE = 1.0
+    MAX_RATE = 200.0
+    
+    def __init__(self, rate_per_s, capacity):
+        self.rate = rate_per_s
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def take(self):
+        """Block until a token is available (or shutdown is requested)"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+                self._last = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            if _stop.wait(wait):
+                return
+    
+    def record(self, success):
+        """Refill faster after successes, back off after failures"""
+        with self._lock:
+            self.rate = min(self.MAX_RATE, max(self.MIN_RATE, self.rate * (1.02 if success else 0.95)))
+
+# Starts at the previous fixed pace of one burst tx every 0.5s
+_burst_bucket = TokenBucket(rate_per_s=2.0, capacity=5)
+
+def _record_burst_result(future):
+    _burst_bucket.record(future.exception() is None and future.result() is not None)
+
 def generate_burst_activity():
     """Generate burst of activity (like DEX trading, NFT minting, etc.)"""
     if not ENABLE_BURST_MODE:
@@ -195,29 +530,40 @@ def generate_burst_activity():
         burst_size = random.randint(5, 15)
         log_message(f"🚀 Generating burst activity: {burst_size} transactions")
         
-        for i in range(burst_size):
-            if not running:
+        for tx, tx_type, amount, from_account, to_account in generate_transaction_batch(burst_size):
+            # Rapid-fire transactions, paced by the adaptive token bucket
+            _burst_bucket.take()
+            if _stop.is_set():
                 break
                 
-            tx, tx_type, amount = generate_realistic_transaction()
-            send_transaction(tx, f"burst_{tx_type}", amount)
-            time.sleep(0.5)  # Rapid-fire transactions
+            future = submit_transaction(tx, f"burst_{tx_type}", amount, from_account, to_account)
+            if future is not None:
+                future.add_done_callback(_record_burst_result)
+
+def _snapshot():
+    """Read all statistics counters in one lock acquisition"""
+    with _stats_lock:
+        return (total_transactions, successful_transactions, failed_transactions, blocks_observed, start_time)
 
 def print_statistics():
     """Print periodic statistics"""
-    uptime = datetime.now() - stats["start_time"]
-    success_rate = (stats["successful_transactions"] / max(stats["total_transactions"], 1)) * 100
+    total, successful, _, blocks, started = _snapshot()
+    
+    # Everything below works on locals, outside the lock
+    hours, remainder = divmod(int(time.monotonic() - started), 3600)
+    minutes, seconds = divmod(remainder, 60)
+    success_rate = (successful / max(total, 1)) * 100
     
     log_message(
-        f"📊 Stats: {stats['total_transactions']} total txs, "
-        f"{stats['successful_transactions']} successful ({success_rate:.1f}%), "
-        f"{stats['blocks_observed']} blocks observed, "
-        f"Uptime: {uptime}"
+        f"📊 Stats: {total} total txs, "
+        f"{successful} successful ({success_rate:.1f}%), "
+        f"{blocks} blocks observed, "
+        f"Uptime: {hours}:{minutes:02d}:{seconds:02d}"
     )
 
 def monitor_blockchain():
     """Background thread to monitor blockchain health"""
-    while running:
+    while not _stop.is_set():
         try:
             validator_ok, sequencer_ok, current_block = check_network_health()
             
@@ -226,17 +572,29 @@ def monitor_blockchain():
             
             if not validator_ok and not sequencer_ok:
                 log_message("⚠️  All endpoints down, waiting for recovery...", "WARN")
-                time.sleep(30)
-            else:
-                time.sleep(60)  # Check every minute
+                if _stop.wait(30):
+                    break
+            elif _stop.wait(60):  # Check every minute
+                break
                 
         except Exception as e:
             log_message(f"Monitor error: {e}", "ERROR")
-            time.sleep(60)
+            if _stop.wait(60):
+                break
 
 def main():
     """Main transaction generation loop"""
-    global running
+    import signal
+    
+    _start_logging()
+    
+    # The RPC helpers import requests lazily; check it here so a missing dependency fails fast
+    # instead of being swallowed by the health check's error handling on every retry
+    try:
+        _get_session()
+    except ImportError as e:
+        log_message(f"Missing dependency: {e} (install it with 'pip install requests')", "ERROR")
+        sys.exit(1)
     
     # Set up signal handlers
     signal.signal(signal.SIGINT, signal_handler)
@@ -244,7 +602,7 @@ def main():
     
     log_message("🚀 Starting LightChain L2 Continuous Transaction Generator")
     log_message(f"🎯 Target: Validator={RPC_URL}, Sequencer={SEQUENCER_URL}")
-    log_message(f"⏱️  Interval: {TX_INTERVAL}s, Burst mode: {ENABLE_BURST_MODE}")
+    log_message(f"⏱️  Interval: {TX_INTERVAL}s, In-flight: {MAX_IN_FLIGHT}, Burst mode: {ENABLE_BURST_MODE}")
     
     # Start monitoring thread
     monitor_thread = threading.Thread(target=monitor_blockchain, daemon=True)
@@ -252,25 +610,27 @@ def main():
     
     # Wait for blockchain to be ready
     log_message("⏳ Waiting for blockchain to be ready...")
-    while running:
+    while not _stop.is_set():
         validator_ok, sequencer_ok, _ = check_network_health()
         if validator_ok or sequencer_ok:
             log_message("✅ Blockchain is ready, starting transaction generation")
             break
-        time.sleep(10)
+        if _stop.wait(10):
+            break
     
-    if not running:
+    if _stop.is_set():
+        log_message("Received shutdown signal. Stopping transaction generator...")
         return
     
     # Main transaction generation loop
     transaction_count = 0
-    last_stats_time = time.time()
+    last_stats_time = time.monotonic()
     
     try:
-        while running:
+        while not _stop.is_set():
             # Generate and send transaction
-            tx, tx_type, amount = generate_realistic_transaction()
-            send_transaction(tx, tx_type, amount)
+            tx, tx_type, amount, from_account, to_account = generate_realistic_transaction()
+            submit_transaction(tx, tx_type, amount, from_account, to_account)
             transaction_count += 1
             
             # Generate burst activity occasionally
@@ -278,19 +638,25 @@ def main():
                 generate_burst_activity()
             
             # Print statistics every 5 minutes
-            if time.time() - last_stats_time > 300:
+            if time.monotonic() - last_stats_time > 300:
                 print_statistics()
-                last_stats_time = time.time()
+                last_stats_time = time.monotonic()
             
             # Sleep with some randomness (realistic timing)
-            sleep_time = TX_INTERVAL + random.uniform(-1, 1)
-            time.sleep(max(1, sleep_time))
+            sleep_time = TX_INTERVAL + random.uniform(-1, 1) * min(TX_INTERVAL, 1)
+            if _stop.wait(max(0, sleep_time)):
+                break
             
     except KeyboardInterrupt:
         log_message("Interrupted by user")
     except Exception as e:
         log_message(f"Unexpected error: {e}", "ERROR")
     finally:
+        if _stop.is_set():
+            log_message("Received shutdown signal. Stopping transaction generator...")
+        # Let in-flight transactions finish before reporting
+        _tx_executor.shutdown(wait=True)
+        _send_executor.shutdown(wait=True, cancel_futures=True)
         print_statistics()
         log_message("🛑 Transaction generator stopped")
 